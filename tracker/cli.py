@@ -3,8 +3,11 @@ Command-line interface for the expense tracker.
 """
 
 import argparse
+import csv
+import io
 import sys
-from typing import List
+from itertools import chain, islice
+from typing import Iterable, List
 from tracker.service import ExpenseService
 from tracker.models import Expense
 from tracker.logger import get_logger
@@ -40,42 +43,59 @@ class ExpenseCLI:
         # Table headers
         headers = ["ID", "Date", "Category", "Amount", "Note"]
         
-        # Calculate column widths
+        # Calculate column widths in a single pass over the expenses
+        id_width = len(headers[0])
+        category_width = len(headers[2])
+        note_width = 0
+        has_note = False
+        for exp in expenses:
+            length = len(exp.id)
+            if length > id_width:
+                id_width = length
+            length = len(exp.category)
+            if length > category_width:
+                category_width = length
+            if exp.note:
+                has_note = True
+                length = len(exp.note)
+                if length > note_width:
+                    note_width = length
+
         col_widths = [
-            max(len(headers[0]), max(len(exp.id) for exp in expenses)),
+            id_width,
             max(len(headers[1]), 10),  # Date is always 10 chars
-            max(len(headers[2]), max(len(exp.category) for exp in expenses)),
+            category_width,
             max(len(headers[3]), 10),  # Amount column
-            max(len(headers[4]), max(len(exp.note) for exp in expenses) if any(exp.note for exp in expenses) else 4)
+            max(len(headers[4]), note_width) if has_note else len(headers[4])
         ]
         
-        # Build table
+        # Build table with one precompiled row template: a single
+        # C-level .format call per row instead of five ljust calls
+        row_fmt = "{:<%d}  {:<%d}  {:<%d}  {:<%d}  {:<%d}" % tuple(col_widths)
+
         lines = []
-        
+        append = lines.append
+
         # Header row
-        header_row = "  ".join(
-            headers[i].ljust(col_widths[i]) for i in range(len(headers))
-        )
-        lines.append(header_row)
-        lines.append("-" * len(header_row))
-        
+        header_row = row_fmt.format(*headers)
+        append(header_row)
+        append("-" * len(header_row))
+
         # Data rows
         for exp in expenses:
-            amount_str = f"{exp.amount:.2f} {exp.currency}"
-            row = "  ".join([
-                exp.id.ljust(col_widths[0]),
-                exp.date.ljust(col_widths[1]),
-                exp.category.ljust(col_widths[2]),
-                amount_str.ljust(col_widths[3]),
-                exp.note.ljust(col_widths[4])
-            ])
-            lines.append(row)
-        
+            append(row_fmt.format(
+                exp.id,
+                exp.date,
+                exp.category,
+                f"{exp.amount:.2f} {exp.currency}",
+                exp.note
+            ))
+
         return "\n".join(lines)
     
     def add(self, args):
         """Handle add command."""
-        logger.info(f"CLI: add command called with args: {args}")
+        logger.info("CLI: add command called with args: %s", args)
         
         try:
             expense = self.service.add_expense(
@@ -89,63 +109,133 @@ class ExpenseCLI:
             print(f"Added: {expense}")
             
         except ValueError as e:
-            logger.error(f"Validation error: {e}")
+            logger.error("Validation error: %s", e)
             print(str(e), file=sys.stderr)
             sys.exit(1)
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
+            logger.error("Unexpected error: %s", e)
             print(f"Error: {e}", file=sys.stderr)
             sys.exit(1)
     
     def list(self, args):
         """Handle list command."""
-        logger.info(f"CLI: list command called with args: {args}")
+        logger.info("CLI: list command called with args: %s", args)
         
         try:
-            expenses = self.service.list_expenses(
-                month=args.month,
-                from_date=args.from_date,
-                to_date=args.to_date,
-                category=args.category,
-                min_amount=args.min,
-                max_amount=args.max,
-                sort_by=args.sort,
-                descending=args.desc,
-                limit=args.limit
-            )
-            
-            # Format output
+            if args.no_sort:
+                # Stream in storage order, skipping the sort entirely
+                expenses = self.service.iter_expenses(
+                    month=args.month,
+                    from_date=args.from_date,
+                    to_date=args.to_date,
+                    category=args.category,
+                    min_amount=args.min,
+                    max_amount=args.max
+                )
+                if args.limit and args.limit > 0:
+                    expenses = islice(expenses, args.limit)
+            else:
+                expenses = self.service.list_expenses(
+                    month=args.month,
+                    from_date=args.from_date,
+                    to_date=args.to_date,
+                    category=args.category,
+                    min_amount=args.min,
+                    max_amount=args.max,
+                    sort_by=args.sort,
+                    descending=args.desc,
+                    limit=args.limit
+                )
+
+            # Format output (single buffered write instead of per-row prints)
             if args.format == "table":
-                print(self.format_expense_table(expenses))
+                if not isinstance(expenses, list):
+                    expenses = list(expenses)
+                sys.stdout.write(self.format_expense_table(expenses) + "\n")
+                sys.stdout.flush()
             elif args.format == "csv":
                 self._print_csv(expenses)
             
         except ValueError as e:
-            logger.error(f"Validation error: {e}")
+            logger.error("Validation error: %s", e)
             print(str(e), file=sys.stderr)
             sys.exit(1)
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
+            logger.error("Unexpected error: %s", e)
             print(f"Error: {e}", file=sys.stderr)
             sys.exit(1)
     
-    def _print_csv(self, expenses: List[Expense]):
-        """Print expenses in CSV format."""
-        if not expenses:
+    def _print_csv(self, expenses: Iterable[Expense]):
+        """Print expenses in CSV format (accepts any iterable)."""
+        iterator = iter(expenses)
+        try:
+            first = next(iterator)
+        except StopIteration:
             print("No expenses found.")
             return
-        
-        # Header
-        print("ID,Date,Category,Amount,Currency,Note")
-        
-        # Rows
-        for exp in expenses:
-            note_escaped = exp.note.replace('"', '""')
-            print(f'{exp.id},{exp.date},{exp.category},{exp.amount:.2f},{exp.currency},"{note_escaped}"')
+
+        # csv.writer is C-implemented and quotes correctly, including
+        # commas and newlines in notes that manual escaping missed.
+        # Rows accumulate in a string buffer and go out in one write.
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(("ID", "Date", "Category", "Amount", "Currency", "Note"))
+        writer.writerows(
+            (exp.id, exp.date, exp.category, f"{exp.amount:.2f}", exp.currency, exp.note)
+            for exp in chain((first,), iterator)
+        )
+
+        sys.stdout.write(buffer.getvalue())
+        sys.stdout.flush()
     
+    def import_csv(self, args):
+        """Handle import command."""
+        logger.info("CLI: import command called with args: %s", args)
+
+        try:
+            with open(args.file, newline='') as f:
+                rows = list(csv.DictReader(f))
+
+            if not rows:
+                print("No rows to import.")
+                return
+
+            expenses = self.service.add_expenses(rows)
+            print(f"Imported {len(expenses)} expenses from {args.file}")
+
+        except ValueError as e:
+            logger.error("Validation error: %s", e)
+            print(str(e), file=sys.stderr)
+            sys.exit(1)
+        except OSError as e:
+            logger.error("Could not read import file: %s", e)
+            print(f"Error: Could not read {args.file} - {e}", file=sys.stderr)
+            sys.exit(1)
+        except Exception as e:
+            logger.error("Unexpected error: %s", e)
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    def export(self, args):
+        """Handle export command."""
+        logger.info("CLI: export command called with args: %s", args)
+
+        try:
+            self.service.export_expenses(args.file)
+            print(f"Exported expenses to {args.file}")
+
+        except ValueError as e:
+            logger.error("Export error: %s", e)
+            print(str(e), file=sys.stderr)
+            sys.exit(1)
+        except Exception as e:
+            logger.error("Unexpected error: %s", e)
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+
     def summary(self, args):
         """Handle summary command."""
-        logger.info(f"CLI: summary command called with args: {args}")
+        logger.info("CLI: summary command called with args: %s", args)
         
         try:
             summary_data = self.service.summary(
@@ -176,17 +266,17 @@ class ExpenseCLI:
                     print(f"  {category.ljust(max_category_len)}  {total:>10.2f} {summary_data['currency']}")
             
         except ValueError as e:
-            logger.error(f"Validation error: {e}")
+            logger.error("Validation error: %s", e)
             print(str(e), file=sys.stderr)
             sys.exit(1)
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
+            logger.error("Unexpected error: %s", e)
             print(f"Error: {e}", file=sys.stderr)
             sys.exit(1)
     
     def delete(self, args):
         """Handle delete command."""
-        logger.info(f"CLI: delete command called with args: {args}")
+        logger.info("CLI: delete command called with args: %s", args)
         
         try:
             result = self.service.delete_expense(args.id)
@@ -198,13 +288,13 @@ class ExpenseCLI:
                 sys.exit(1)
                 
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
+            logger.error("Unexpected error: %s", e)
             print(f"Error: {e}", file=sys.stderr)
             sys.exit(1)
     
     def edit(self, args):
         """Handle edit command."""
-        logger.info(f"CLI: edit command called with args: {args}")
+        logger.info("CLI: edit command called with args: %s", args)
         
         try:
             # Check if at least one field is provided
@@ -228,22 +318,36 @@ class ExpenseCLI:
                 sys.exit(1)
                 
         except ValueError as e:
-            logger.error(f"Validation error: {e}")
+            logger.error("Validation error: %s", e)
             print(str(e), file=sys.stderr)
             sys.exit(1)
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
+            logger.error("Unexpected error: %s", e)
             print(f"Error: {e}", file=sys.stderr)
             sys.exit(1)
 
 
+_PARSER = None
+
+
 def create_parser() -> argparse.ArgumentParser:
     """
     Create and configure argument parser.
-    
+
+    The parser is built once and memoized, so repeated invocations of
+    main() (tests, embedding) don't pay parser construction again.
+
     Returns:
         Configured ArgumentParser instance
     """
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = _build_parser()
+    return _PARSER
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser with all subcommands."""
     parser = argparse.ArgumentParser(
         prog="tracker",
         description="Personal expense tracker CLI"
@@ -269,9 +373,18 @@ def create_parser() -> argparse.ArgumentParser:
     list_parser.add_argument("--max", type=float, help="Maximum amount")
     list_parser.add_argument("--sort", choices=["date", "amount", "category"], default="date", help="Sort by field")
     list_parser.add_argument("--desc", action="store_true", help="Sort in descending order")
+    list_parser.add_argument("--no-sort", action="store_true", help="Stream results in storage order (skips sorting)")
     list_parser.add_argument("--limit", type=int, help="Limit number of results")
     list_parser.add_argument("--format", choices=["table", "csv"], default="table", help="Output format")
     
+    # Import command
+    import_parser = subparsers.add_parser("import", help="Import expenses from a CSV file")
+    import_parser.add_argument("--file", required=True, help="CSV file with date,category,amount,note,currency columns")
+
+    # Export command
+    export_parser = subparsers.add_parser("export", help="Export expenses to a readable JSON file")
+    export_parser.add_argument("--file", required=True, help="Destination JSON file")
+
     # Summary command
     summary_parser = subparsers.add_parser("summary", help="Show expense summary")
     summary_parser.add_argument("--month", help="Filter by month (YYYY-MM)")
@@ -295,33 +408,43 @@ def create_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def main():
-    """Main entry point for CLI."""
+def main(argv=None):
+    """
+    Main entry point for CLI.
+
+    Args:
+        argv: Argument list to parse (defaults to sys.argv)
+    """
     parser = create_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     if not args.command:
         parser.print_help()
         sys.exit(1)
     
     # Initialize service and CLI
-    service = ExpenseService()
+    try:
+        service = ExpenseService()
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
     cli = ExpenseCLI(service)
     
     # Dispatch to appropriate handler
-    if args.command == "add":
-        cli.add(args)
-    elif args.command == "list":
-        cli.list(args)
-    elif args.command == "summary":
-        cli.summary(args)
-    elif args.command == "delete":
-        cli.delete(args)
-    elif args.command == "edit":
-        cli.edit(args)
-    else:
+    dispatch = {
+        "add": cli.add,
+        "list": cli.list,
+        "import": cli.import_csv,
+        "export": cli.export,
+        "summary": cli.summary,
+        "delete": cli.delete,
+        "edit": cli.edit
+    }
+    handler = dispatch.get(args.command)
+    if handler is None:
         parser.print_help()
         sys.exit(1)
+    handler(args)
 
 
 if __name__ == "__main__":
@@ -2,48 +2,83 @@
 Logging configuration for the expense tracker.
 """
 
+import atexit
 import logging
 import os
-from pathlib import Path
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
 
+_queue = None
+_listener = None
+_CONFIGURED = False
 
-def get_logger(name: str) -> logging.Logger:
+
+class _LazyFileHandler(logging.FileHandler):
+    """File handler that creates the log directory on first emit."""
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename) or '.', exist_ok=True)
+        return super()._open()
+
+
+def _get_queue() -> SimpleQueue:
     """
-    Get a configured logger instance.
-    
-    Args:
-        name: Name of the logger (usually __name__ of the module)
-        
-    Returns:
-        Configured logger instance
+    Get the shared logging queue, starting the background listener once.
+
+    Loggers enqueue records and return immediately; a single
+    QueueListener thread drains the queue into the real handlers, so
+    log I/O never blocks the calling code.
     """
-    # Create logs directory if it doesn't exist
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
-    
-    logger = logging.getLogger(name)
-    
-    # Only configure if not already configured
-    if not logger.handlers:
-        logger.setLevel(logging.INFO)
-        
-        # File handler
-        file_handler = logging.FileHandler("logs/tracker.log")
-        file_handler.setLevel(logging.INFO)
-        
-        # Console handler (for errors only)
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.ERROR)
-        
-        # Formatter
+    global _queue, _listener
+
+    if _queue is None:
+        _queue = SimpleQueue()
+
         formatter = logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
+
+        # File handler; delay=True defers opening (and creating logs/)
+        # until the first record is actually emitted
+        file_handler = _LazyFileHandler("logs/tracker.log", delay=True)
+        file_handler.setLevel(logging.INFO)
         file_handler.setFormatter(formatter)
+
+        # Console handler (for errors only)
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.ERROR)
         console_handler.setFormatter(formatter)
-        
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
-    
-    return logger
\ No newline at end of file
+
+        _listener = QueueListener(
+            _queue, file_handler, console_handler, respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(_listener.stop)
+
+    return _queue
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Get a configured logger instance.
+
+    Handlers are attached once to the package-level "tracker" logger;
+    module loggers inherit them through propagation, so repeated calls
+    do no setup work at all.
+
+    Args:
+        name: Name of the logger (usually __name__ of the module)
+
+    Returns:
+        Configured logger instance
+    """
+    global _CONFIGURED
+
+    if not _CONFIGURED:
+        package_logger = logging.getLogger("tracker")
+        package_logger.setLevel(logging.INFO)
+        package_logger.addHandler(QueueHandler(_get_queue()))
+        _CONFIGURED = True
+
+    return logging.getLogger(name)
@@ -2,12 +2,13 @@
 Data models for the expense tracker.
 """
 
+import sys
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Expense:
     """
     Represents a single expense entry.
@@ -28,7 +29,13 @@ class Expense:
     currency: str = "BDT"
     note: str = ""
     created_at: str = ""
-    
+
+    def __post_init__(self):
+        # Intern the category so the few distinct values share a single
+        # string object; equality checks in filter loops then hit the
+        # pointer-comparison fast path
+        self.category = sys.intern(self.category)
+
     def to_dict(self) -> dict:
         """Convert expense to dictionary."""
         return asdict(self)
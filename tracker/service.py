@@ -2,15 +2,31 @@
 Business logic layer for expense operations.
 """
 
+import heapq
+import sys
+from collections import defaultdict
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from operator import attrgetter
+from typing import Iterable, List, Optional, Dict, Any
 from tracker.models import Expense
 from tracker.storage import ExpenseStorage
 from tracker.validation import format_date, format_amount, format_category
 from tracker.logger import get_logger
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; pure-Python paths cover its absence
+    np = None
+
 logger = get_logger(__name__)
 
+# C-level sort keys, built once instead of a lambda per sort call
+_SORT_KEYS = {
+    "amount": attrgetter("amount"),
+    "category": attrgetter("category"),
+    "date": attrgetter("date")
+}
+
 
 class ExpenseService:
     """Service layer for expense business logic."""
@@ -36,23 +52,9 @@ class ExpenseService:
         Returns:
             Unique expense ID
         """
-        # Get all expenses for the same date
-        all_expenses = self.storage.load_all()
-        date_prefix = f"EXP-{date.replace('-', '')}"
-        
-        # Find highest sequence number for this date
-        max_seq = 0
-        for exp in all_expenses:
-            if exp.id.startswith(date_prefix):
-                try:
-                    seq = int(exp.id.split('-')[-1])
-                    max_seq = max(max_seq, seq)
-                except ValueError:
-                    continue
-        
-        # Generate new ID with next sequence number
-        new_seq = max_seq + 1
-        return f"{date_prefix}-{new_seq:04d}"
+        # Storage keeps a per-date max-sequence index, so this is O(1)
+        # instead of a full scan of every expense.
+        return self.storage.next_id(date)
     
     def add_expense(
         self,
@@ -78,7 +80,7 @@ class ExpenseService:
         Raises:
             ValueError: If validation fails
         """
-        logger.info(f"Adding expense: category={category}, amount={amount}")
+        logger.info("Adding expense: category=%s, amount=%s", category, amount)
         
         # Validate and format inputs
         formatted_date = format_date(date)
@@ -102,10 +104,60 @@ class ExpenseService:
         
         # Save to storage
         self.storage.add(expense)
-        logger.info(f"Successfully added expense: {expense_id}")
+        logger.info("Successfully added expense: %s", expense_id)
         
         return expense
     
+    def add_expenses(self, rows: List[Dict[str, Any]]) -> List[Expense]:
+        """
+        Add many expenses with a single storage write.
+
+        Rows are validated and assigned IDs against an in-memory view of
+        the per-date sequence counters, then persisted via add_many, so
+        a bulk import writes the data file exactly once instead of once
+        per expense.
+
+        Args:
+            rows: List of dicts with date/category/amount/note/currency
+                keys (same semantics as add_expense arguments)
+
+        Returns:
+            List of created Expense objects
+
+        Raises:
+            ValueError: If validation fails for any row (nothing is saved)
+        """
+        logger.info("Adding %s expenses in batch", len(rows))
+
+        created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        seq_by_date: Dict[str, int] = {}
+        expenses = []
+
+        for row in rows:
+            formatted_date = format_date(row.get("date"))
+            formatted_amount = format_amount(row.get("amount", 0.0))
+            formatted_category = format_category(row.get("category", ""))
+
+            date_key = formatted_date.replace('-', '')
+            seq = seq_by_date.get(date_key)
+            seq = self.storage.next_seq(date_key) if seq is None else seq + 1
+            seq_by_date[date_key] = seq
+
+            expenses.append(Expense(
+                id=f"EXP-{date_key}-{seq:04d}",
+                date=formatted_date,
+                category=formatted_category,
+                amount=formatted_amount,
+                currency=row.get("currency") or "BDT",
+                note=(row.get("note") or "").strip(),
+                created_at=created_at
+            ))
+
+        self.storage.add_many(expenses)
+        logger.info("Successfully added %s expenses in batch", len(expenses))
+
+        return expenses
+
     def list_expenses(
         self,
         month: Optional[str] = None,
@@ -135,66 +187,97 @@ class ExpenseService:
         Returns:
             Filtered and sorted list of expenses
         """
-        logger.info(f"Listing expenses with filters: month={month}, category={category}")
-        
-        expenses = self.storage.load_all()
-        
-        # Apply filters
-        filtered = self._apply_filters(
-            expenses,
+        logger.info("Listing expenses with filters: month=%s, category=%s", month, category)
+
+        filtered = list(self.iter_expenses(
             month=month,
             from_date=from_date,
             to_date=to_date,
             category=category,
             min_amount=min_amount,
             max_amount=max_amount
-        )
-        
-        # Sort
-        sorted_expenses = self._sort_expenses(filtered, sort_by, descending)
-        
-        # Apply limit
-        if limit and limit > 0:
-            sorted_expenses = sorted_expenses[:limit]
-        
-        logger.info(f"Returning {len(sorted_expenses)} expenses")
+        ))
+        
+        # Sort and apply limit. When only the top K of N rows are wanted,
+        # a heap selection is O(N log K) instead of a full O(N log N) sort.
+        if limit and 0 < limit < len(filtered):
+            key = _SORT_KEYS.get(sort_by, _SORT_KEYS["date"])
+            if descending:
+                sorted_expenses = heapq.nlargest(limit, filtered, key=key)
+            else:
+                sorted_expenses = heapq.nsmallest(limit, filtered, key=key)
+        else:
+            sorted_expenses = self._sort_expenses(filtered, sort_by, descending)
+
+        logger.info("Returning %s expenses", len(sorted_expenses))
         return sorted_expenses
     
-    def _apply_filters(
+    def iter_expenses(
         self,
-        expenses: List[Expense],
         month: Optional[str] = None,
         from_date: Optional[str] = None,
         to_date: Optional[str] = None,
         category: Optional[str] = None,
         min_amount: Optional[float] = None,
         max_amount: Optional[float] = None
-    ) -> List[Expense]:
-        """Apply filters to expense list."""
-        filtered = expenses
-        
-        # Month filter
-        if month:
-            filtered = [exp for exp in filtered if exp.date.startswith(month)]
-        
-        # Date range filters
-        if from_date:
-            filtered = [exp for exp in filtered if exp.date >= from_date]
-        if to_date:
-            filtered = [exp for exp in filtered if exp.date <= to_date]
-        
-        # Category filter (case-insensitive)
-        if category:
-            category_lower = category.lower()
-            filtered = [exp for exp in filtered if exp.category.lower() == category_lower]
-        
-        # Amount filters
-        if min_amount is not None:
-            filtered = [exp for exp in filtered if exp.amount >= min_amount]
-        if max_amount is not None:
-            filtered = [exp for exp in filtered if exp.amount <= max_amount]
-        
-        return filtered
+    ):
+        """
+        Iterate expenses matching the filters, in storage order.
+
+        Unlike list_expenses this never sorts and yields lazily, so
+        streaming consumers (CSV output, aggregation) don't need the
+        whole filtered result in memory at once.
+
+        Args:
+            month: Filter by month (YYYY-MM format)
+            from_date: Filter from date (inclusive)
+            to_date: Filter to date (inclusive)
+            category: Filter by category (case-insensitive)
+            min_amount: Minimum amount filter
+            max_amount: Maximum amount filter
+
+        Returns:
+            Iterator of matching Expense objects
+        """
+        return self._filter_iter(
+            self.storage.iter_all(),
+            month=month,
+            from_date=from_date,
+            to_date=to_date,
+            category=category,
+            min_amount=min_amount,
+            max_amount=max_amount
+        )
+
+    def _filter_iter(
+        self,
+        expenses: Iterable[Expense],
+        month: Optional[str] = None,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        category: Optional[str] = None,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None
+    ):
+        """Yield expenses matching the active filters."""
+        # Categories are interned on Expense construction, so an interned
+        # lowercase needle makes the common comparison a pointer check;
+        # the .lower() fallback keeps matching case-insensitive.
+        category_lower = category.lower() if category else None
+        category_key = sys.intern(category_lower) if category_lower else None
+
+        # One short-circuiting pass instead of one list rebuild per filter
+        return (
+            exp for exp in expenses
+            if (not month or exp.date.startswith(month))
+            and (not from_date or exp.date >= from_date)
+            and (not to_date or exp.date <= to_date)
+            and (category_key is None
+                 or exp.category is category_key
+                 or exp.category.lower() == category_lower)
+            and (min_amount is None or exp.amount >= min_amount)
+            and (max_amount is None or exp.amount <= max_amount)
+        )
     
     def _sort_expenses(
         self,
@@ -202,13 +285,9 @@ class ExpenseService:
         sort_by: str,
         descending: bool
     ) -> List[Expense]:
-        """Sort expenses by specified field."""
-        if sort_by == "amount":
-            return sorted(expenses, key=lambda x: x.amount, reverse=descending)
-        elif sort_by == "category":
-            return sorted(expenses, key=lambda x: x.category, reverse=descending)
-        else:  # Default to date
-            return sorted(expenses, key=lambda x: x.date, reverse=descending)
+        """Sort expenses by specified field (defaults to date)."""
+        key = _SORT_KEYS.get(sort_by, _SORT_KEYS["date"])
+        return sorted(expenses, key=key, reverse=descending)
     
     def summary(
         self,
@@ -234,44 +313,99 @@ class ExpenseService:
                 - currency: Currency code
                 - period: Description of period
         """
-        logger.info(f"Generating summary: month={month}, category={category}")
-        
-        # Get filtered expenses
-        expenses = self.list_expenses(
-            month=month,
-            from_date=from_date,
-            to_date=to_date,
-            category=category
-        )
-        
-        if not expenses:
-            return {
-                "count": 0,
-                "grand_total": 0.0,
-                "totals_by_category": {},
-                "currency": "BDT",
-                "period": self._get_period_description(month, from_date, to_date)
-            }
-        
-        # Calculate totals
-        grand_total = sum(exp.amount for exp in expenses)
-        currency = expenses[0].currency  # Assume all same currency
-        
-        # Calculate category totals
-        category_totals = {}
-        for exp in expenses:
-            if exp.category not in category_totals:
-                category_totals[exp.category] = 0.0
-            category_totals[exp.category] += exp.amount
-        
+        logger.info("Generating summary: month=%s, category=%s", month, category)
+
+        if np is not None:
+            # Vectorized aggregation over storage columns
+            count, grand_total, category_totals, currency = self._summarize_columns(
+                month, from_date, to_date, category
+            )
+        else:
+            # Aggregate in one pass over the filtered expenses; sorting is
+            # irrelevant to totals, so skip list_expenses entirely.
+            # Totals accumulate in integer cents: amounts are rounded to
+            # two decimals at the validation edge, so the cent value is
+            # exact and integer adds cannot accrue float error the way
+            # repeated float += does over long histories.
+            count = 0
+            total_cents = 0
+            # defaultdict drops the membership branch (and .get call) per
+            # row; with interned categories the key hash is near-free
+            cents_by_category = defaultdict(int)
+            currency = None
+
+            for exp in self._filter_iter(
+                self.storage.load_all_cached(),
+                month=month,
+                from_date=from_date,
+                to_date=to_date,
+                category=category
+            ):
+                cents = round(exp.amount * 100)
+                count += 1
+                total_cents += cents
+                cents_by_category[exp.category] += cents
+                if currency is None:
+                    currency = exp.currency  # Assume all same currency
+
+            category_totals = {
+                cat: cents / 100 for cat, cents in cents_by_category.items()}
+            grand_total = total_cents / 100
+
         return {
-            "count": len(expenses),
+            "count": count,
             "grand_total": grand_total,
             "totals_by_category": category_totals,
-            "currency": currency,
+            "currency": currency or "BDT",
             "period": self._get_period_description(month, from_date, to_date)
         }
     
+    def _summarize_columns(self, month, from_date, to_date, category):
+        """
+        Vectorized summary aggregation over storage columns.
+
+        Builds a boolean mask from the active filters and reduces the
+        amounts column with NumPy instead of iterating Expense objects.
+
+        Returns:
+            Tuple of (count, grand_total, category_totals, currency)
+        """
+        columns = self.storage.load_columns()
+        if not columns["dates"]:
+            return 0, 0.0, {}, None
+
+        dates = np.asarray(columns["dates"])
+        categories = np.asarray(columns["categories"])
+        amounts = np.asarray(columns["amounts"])
+
+        mask = np.ones(len(dates), dtype=bool)
+        if month:
+            mask &= np.char.startswith(dates, month)
+        if from_date:
+            mask &= dates >= from_date
+        if to_date:
+            mask &= dates <= to_date
+        if category:
+            mask &= np.char.lower(categories) == category.lower()
+
+        count = int(mask.sum())
+        if count == 0:
+            return 0, 0.0, {}, None
+
+        # Sum in integer cents, as the scalar path does, so both
+        # branches produce identical exact totals
+        selected_cents = np.rint(amounts[mask] * 100).astype(np.int64)
+        selected_categories = categories[mask]
+
+        grand_total = int(selected_cents.sum()) / 100
+        category_totals = {
+            str(cat): int(selected_cents[selected_categories == cat].sum()) / 100
+            for cat in np.unique(selected_categories)
+        }
+        currency = columns["currencies"][int(np.flatnonzero(mask)[0])]
+
+        return count, grand_total, category_totals, currency
+
     def _get_period_description(
         self,
         month: Optional[str],
@@ -300,13 +434,13 @@ class ExpenseService:
         Returns:
             True if deleted, False if not found
         """
-        logger.info(f"Deleting expense: {expense_id}")
+        logger.info("Deleting expense: %s", expense_id)
         result = self.storage.delete(expense_id)
         
         if result:
-            logger.info(f"Successfully deleted expense: {expense_id}")
+            logger.info("Successfully deleted expense: %s", expense_id)
         else:
-            logger.warning(f"Expense not found: {expense_id}")
+            logger.warning("Expense not found: %s", expense_id)
         
         return result
     
@@ -333,7 +467,7 @@ class ExpenseService:
         Returns:
             Updated Expense object or None if not found
         """
-        logger.info(f"Editing expense: {expense_id}")
+        logger.info("Editing expense: %s", expense_id)
         
         # Build updates dictionary
         updates = {}
@@ -353,8 +487,18 @@ class ExpenseService:
         result = self.storage.update(expense_id, updates)
         
         if result:
-            logger.info(f"Successfully edited expense: {expense_id}")
+            logger.info("Successfully edited expense: %s", expense_id)
         else:
-            logger.warning(f"Expense not found: {expense_id}")
+            logger.warning("Expense not found: %s", expense_id)
         
-        return result
\ No newline at end of file
+        return result
+
+    def export_expenses(self, dest_path: str):
+        """
+        Export all expenses to a human-readable JSON file.
+
+        Args:
+            dest_path: Path of the JSON file to write
+        """
+        logger.info("Exporting expenses to: %s", dest_path)
+        self.storage.export_pretty(dest_path)
@@ -1,74 +1,408 @@
 """
-Storage layer for persisting expenses to JSON file.
+Storage layer for persisting expenses to an NDJSON file.
+
+The data file holds one JSON object per line, so adding an expense is a
+single O(1) append instead of a rewrite of the whole file. Deletes and
+updates are appended as small {"op": ...} mutation records that are
+replayed on load and folded into plain rows when the file is compacted.
+Legacy single-document JSON files are migrated transparently on first
+use.
 """
 
 import json
 import os
-from typing import List, Optional
-from pathlib import Path
+import sys
+import zlib
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Optional
 from tracker.models import Expense
 from tracker.logger import get_logger
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib json module is the fallback
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; advisory locking is skipped
+    fcntl = None
+
 logger = get_logger(__name__)
 
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so error
+# handling below works with either implementation
+_loads = orjson.loads if orjson is not None else json.loads
+
+# Number of superseded records (tombstones/patches) tolerated in the
+# data file before a load triggers compaction
+_COMPACT_THRESHOLD = 256
+
+# Expense fields that update() may set in place
+_UPDATABLE_FIELDS = frozenset(
+    ("date", "category", "amount", "currency", "note"))
+
+# Data files at least this large are parsed with a thread pool; below
+# it the executor costs more than it saves
+_PARALLEL_THRESHOLD = 1 << 20
+
 
 class ExpenseStorage:
-    """Handles reading and writing expenses to JSON file."""
-    
-    def __init__(self, filepath: str = "data/expenses.json"):
+    """Handles reading and writing expenses to an NDJSON file."""
+
+    def __init__(self, filepath: str = "data/expenses.ndjson"):
         """
         Initialize storage with file path.
-        
+
         Args:
-            filepath: Path to JSON file for storing expenses
+            filepath: Path to NDJSON file for storing expenses
         """
         self.filepath = filepath
+        self._cache: Optional[List[Expense]] = None
+        self._by_id: Optional[Dict[str, Expense]] = None
+        self._mtime: Optional[int] = None
+        self._max_seq_by_date: Optional[Dict[str, int]] = None
+        self._batch_buf: Optional[List[str]] = None
+        self._append_f = None
         self._ensure_file_exists()
-    
+        self._open_data_file()
+
     def _ensure_file_exists(self):
         """Create the data directory and file if they don't exist."""
         try:
-            # Create directory if it doesn't exist
-            Path(self.filepath).parent.mkdir(parents=True, exist_ok=True)
-            
-            # Create file with initial structure if it doesn't exist
+            # Create directory if it doesn't exist; os.makedirs avoids
+            # constructing Path objects on every startup
+            os.makedirs(os.path.dirname(self.filepath) or '.', exist_ok=True)
+
             if not os.path.exists(self.filepath):
-                initial_data = {
-                    "version": 1,
-                    "expenses": []
-                }
-                with open(self.filepath, 'w') as f:
-                    json.dump(initial_data, f, indent=2)
-                logger.info(f"Created new data file: {self.filepath}")
+                # Migrate a legacy single-document JSON file if present,
+                # otherwise start with an empty file
+                legacy_path = os.path.splitext(self.filepath)[0] + ".json"
+                if os.path.exists(legacy_path):
+                    self._migrate_legacy_file(legacy_path)
+                else:
+                    open(self.filepath, 'w').close()
+                    logger.info("Created new data file: %s", self.filepath)
         except Exception as e:
-            logger.error(f"Failed to ensure file exists: {e}")
+            logger.error("Failed to ensure file exists: %s", e)
             raise
-    
+
+    def _open_data_file(self):
+        """
+        Open (or reopen) the persistent append handle, taking the lock.
+
+        Appends reuse this handle instead of paying an open/close
+        syscall pair per write. The advisory flock makes a second
+        process fail fast instead of interleaving writes; it is held
+        for the storage's lifetime and must be re-acquired whenever
+        compaction swaps a new file in under us.
+        """
+        if self._append_f is not None:
+            self._append_f.close()
+        self._append_f = open(self.filepath, 'a')
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._append_f.fileno(),
+                            fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                self._append_f.close()
+                self._append_f = None
+                logger.error("Data file is locked: %s", self.filepath)
+                raise ValueError(
+                    f"Error: Data file is in use by another process: {self.filepath}")
+
+    def close(self):
+        """Release the data file handle and its advisory lock."""
+        if self._append_f is not None:
+            self._append_f.close()
+            self._append_f = None
+
+    def _migrate_legacy_file(self, legacy_path: str):
+        """Convert a legacy {"version", "expenses"} JSON document to NDJSON."""
+        with open(legacy_path, 'r') as f:
+            data = json.load(f)
+        records = data.get("expenses", [])
+        with open(self.filepath, 'w') as f:
+            f.writelines(self._encode_record(record) for record in records)
+        logger.info("Migrated %s expenses from %s to %s",
+                    len(records), legacy_path, self.filepath)
+
+    @staticmethod
+    def _encode_record(record: dict) -> str:
+        """Encode a record as one CRC32-framed NDJSON line."""
+        if orjson is not None:
+            payload = orjson.dumps(record)
+            return f"{payload.decode()} {zlib.crc32(payload):08x}\n"
+        # Compact separators: nobody reads the hot file between
+        # operations, and the whitespace is pure encode/decode overhead
+        payload = json.dumps(record, separators=(',', ':'))
+        return f"{payload} {zlib.crc32(payload.encode()):08x}\n"
+
+    @staticmethod
+    def _decode_line_bytes(line: bytes):
+        """
+        Parse one raw NDJSON line, verifying its CRC.
+
+        Returns:
+            The decoded record, or None if the line is torn — either a
+            checksum mismatch or unparseable JSON. A truncated write
+            usually cuts the checksum off entirely, so a parse failure
+            means the same thing a bad CRC does.
+        """
+        payload, _, tail = line.rpartition(b' ')
+        if payload and len(tail) == 8:
+            try:
+                expected = int(tail, 16)
+            except ValueError:
+                payload = line  # legacy line without checksum
+            else:
+                if zlib.crc32(payload) != expected:
+                    return None
+        else:
+            payload = line
+        try:
+            return _loads(payload)
+        except json.JSONDecodeError:
+            return None
+
+    def _iter_records(self):
+        """Yield parsed records from the data file in order."""
+        with open(self.filepath, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield self._decode_line_bytes(line)
+
+    def _iter_records_parallel(self):
+        """
+        Yield parsed records, decoding lines on a thread pool.
+
+        orjson releases the GIL while parsing, so worker threads get
+        real parallelism on large files; chunksize keeps the per-task
+        dispatch overhead amortized. Order is preserved by ex.map.
+        """
+        with open(self.filepath, 'rb') as f:
+            data = f.read()
+        lines = [line for line in map(bytes.strip, data.split(b'\n')) if line]
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+            yield from ex.map(self._decode_line_bytes, lines, chunksize=1024)
+
     def load_all(self) -> List[Expense]:
         """
         Load all expenses from file.
-        
+
         Returns:
             List of Expense objects
         """
         try:
-            with open(self.filepath, 'r') as f:
-                data = json.load(f)
-                expenses_data = data.get("expenses", [])
-                expenses = [Expense.from_dict(exp) for exp in expenses_data]
-                logger.info(f"Loaded {len(expenses)} expenses from file")
-                return expenses
+            expenses: List[Optional[Expense]] = []
+            positions: Dict[str, int] = {}
+            superseded = 0
+
+            if (orjson is not None
+                    and os.path.getsize(self.filepath) >= _PARALLEL_THRESHOLD):
+                records = self._iter_records_parallel()
+            else:
+                records = self._iter_records()
+
+            corrupt_tail = False
+            for record in records:
+                if record is None:
+                    # A torn write leaves a bad tail; keep everything
+                    # up to it instead of refusing to start
+                    logger.warning("Checksum mismatch in %s; discarding "
+                                   "remainder of file", self.filepath)
+                    corrupt_tail = True
+                    break
+                op = record.get("op")
+                if op is None:
+                    # Plain expense row
+                    positions[record["id"]] = len(expenses)
+                    expenses.append(Expense.from_dict(record))
+                elif op == "del":
+                    i = positions.pop(record["id"], None)
+                    if i is not None:
+                        expenses[i] = None
+                    superseded += 1
+                elif op == "upd":
+                    i = positions.get(record["id"])
+                    if i is not None:
+                        exp_dict = expenses[i].to_dict()
+                        exp_dict.update(record.get("set", {}))
+                        expenses[i] = Expense.from_dict(exp_dict)
+                    superseded += 1
+
+            expenses = [exp for exp in expenses if exp is not None]
+
+            if corrupt_tail or superseded >= _COMPACT_THRESHOLD:
+                if corrupt_tail:
+                    # Keep the original bytes around before rewriting: if
+                    # the bad record sat mid-file (bit rot rather than a
+                    # torn tail), everything after it can still be
+                    # salvaged from the backup by hand
+                    backup_path = self.filepath + '.corrupt'
+                    os.replace(self.filepath, backup_path)
+                    logger.warning("Backed up corrupt data file to %s", backup_path)
+                # Fold the mutation records into plain rows (dropping any
+                # corrupt tail); save_all adopts a copy of the list as
+                # the cache, so return that copy — callers like delete()
+                # mutate the returned list assuming it IS the cache
+                logger.info("Compacting data file (%s superseded records)", superseded)
+                self.save_all(expenses)
+                expenses = self._cache
+            else:
+                self._index_sequences(expenses)
+                self._cache = expenses
+                self._by_id = {exp.id: exp for exp in expenses}
+                self._note_mtime()
+
+            logger.info("Loaded %s expenses from file", len(expenses))
+            return expenses
         except json.JSONDecodeError as e:
-            logger.error(f"Corrupted JSON file: {e}")
+            logger.error("Corrupted data file: %s", e)
             raise ValueError(f"Error: Data file is corrupted. Please check {self.filepath}")
         except FileNotFoundError:
-            logger.warning(f"File not found: {self.filepath}")
+            logger.warning("File not found: %s", self.filepath)
             self._ensure_file_exists()
             return []
         except Exception as e:
-            logger.error(f"Failed to load expenses: {e}")
+            logger.error("Failed to load expenses: %s", e)
             raise ValueError(f"Error: Could not read data file - {e}")
     
+    def load_all_cached(self) -> List[Expense]:
+        """
+        Load all expenses, reusing the in-memory cache when available.
+
+        The cache is keyed by the data file's mtime: as long as the file
+        has not been touched by another process, repeated reads and this
+        process's own writes are served without re-parsing.
+
+        Returns:
+            List of Expense objects
+        """
+        if self._cache is not None:
+            try:
+                if os.stat(self.filepath).st_mtime_ns == self._mtime:
+                    return self._cache
+            except OSError:
+                pass
+        return self.load_all()
+
+    def iter_all(self):
+        """
+        Iterate expenses without materializing the whole list.
+
+        A warm in-memory cache is served directly. Otherwise the file is
+        scanned twice: a first pass records which rows later mutation
+        records delete or patch, and a second pass yields the surviving
+        Expense objects one at a time, so peak memory stays at one row
+        plus the small mutation maps instead of the full history.
+
+        Yields:
+            Expense objects in storage order
+        """
+        if self._cache is not None:
+            try:
+                if os.stat(self.filepath).st_mtime_ns == self._mtime:
+                    yield from self._cache
+                    return
+            except OSError:
+                pass
+
+        try:
+            # Pass 1: map mutation records onto the row lines they affect
+            positions: Dict[str, int] = {}
+            deleted = set()
+            patches: Dict[int, dict] = {}
+
+            with open(self.filepath, 'rb') as f:
+                for lineno, line in enumerate(f):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    record = self._decode_line_bytes(line)
+                    if record is None:
+                        # Torn record: hand off to load_all so the same
+                        # warn/backup/compact repair runs here as on the
+                        # eager path, then serve the repaired cache
+                        yield from self.load_all()
+                        return
+                    op = record.get("op")
+                    if op is None:
+                        positions[record["id"]] = lineno
+                    elif op == "del":
+                        target = positions.pop(record["id"], None)
+                        if target is not None:
+                            deleted.add(target)
+                    elif op == "upd":
+                        target = positions.get(record["id"])
+                        if target is not None:
+                            patches.setdefault(target, {}).update(record.get("set", {}))
+
+            # Pass 2: stream the surviving rows
+            with open(self.filepath, 'rb') as f:
+                for lineno, line in enumerate(f):
+                    line = line.strip()
+                    if not line or lineno in deleted:
+                        continue
+                    record = self._decode_line_bytes(line)
+                    if record is None or record.get("op") is not None:
+                        continue
+                    patch = patches.get(lineno)
+                    if patch:
+                        record.update(patch)
+                    yield Expense.from_dict(record)
+        except json.JSONDecodeError as e:
+            logger.error("Corrupted data file: %s", e)
+            raise ValueError(f"Error: Data file is corrupted. Please check {self.filepath}")
+        except FileNotFoundError:
+            logger.warning("File not found: %s", self.filepath)
+            self._ensure_file_exists()
+
+    def _note_mtime(self):
+        """Remember the data file's current mtime for cache validation."""
+        try:
+            self._mtime = os.stat(self.filepath).st_mtime_ns
+        except OSError:
+            self._mtime = None
+
+    def load_columns(self) -> Dict[str, list]:
+        """
+        Load expenses as parallel per-field columns.
+
+        Bulk operations that only touch one or two fields (summaries,
+        amount filters) can scan these narrow columns instead of pulling
+        whole Expense objects through the cache; the amounts column is a
+        compact float array suitable for vectorized aggregation.
+
+        Returns:
+            Dict with 'ids', 'dates', 'categories', 'currencies' lists
+            and an 'amounts' float array
+        """
+        expenses = self.load_all_cached()
+
+        ids = []
+        dates = []
+        categories = []
+        currencies = []
+        amounts = array('d')
+        for exp in expenses:
+            ids.append(exp.id)
+            dates.append(exp.date)
+            categories.append(exp.category)
+            currencies.append(exp.currency)
+            amounts.append(exp.amount)
+
+        return {
+            "ids": ids,
+            "dates": dates,
+            "categories": categories,
+            "amounts": amounts,
+            "currencies": currencies
+        }
+
     def save_all(self, expenses: List[Expense]):
         """
         Save all expenses to file.
@@ -76,30 +410,167 @@ class ExpenseStorage:
         Args:
             expenses: List of Expense objects to save
         """
+        # Write to a temp file and atomically swap it in, so a crash
+        # mid-write can never leave a truncated or half-written file
+        tmp_path = self.filepath + '.tmp'
         try:
-            data = {
-                "version": 1,
-                "expenses": [exp.to_dict() for exp in expenses]
-            }
-            with open(self.filepath, 'w') as f:
-                json.dump(data, f, indent=2)
-            logger.info(f"Saved {len(expenses)} expenses to file")
+            # Build the whole payload first so the file sees one large
+            # write instead of one buffered write per row
+            payload = "".join(
+                self._encode_record(exp.to_dict()) for exp in expenses)
+            with open(tmp_path, 'w') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.filepath)
+            # The replace left the append handle (and its lock) on the
+            # old inode; reopen against the new file
+            self._open_data_file()
+            logger.info("Saved %s expenses to file", len(expenses))
         except Exception as e:
-            logger.error(f"Failed to save expenses: {e}")
+            logger.error("Failed to save expenses: %s", e)
             raise ValueError(f"Error: Could not write to data file - {e}")
+
+        # The written list is the current state; keep serving it from
+        # memory instead of re-parsing our own write
+        self._cache = list(expenses)
+        self._by_id = {exp.id: exp for exp in self._cache}
+        self._index_sequences(self._cache)
+        self._note_mtime()
     
+    def _index_sequences(self, expenses: List[Expense]):
+        """Build the per-date max-sequence index from expense IDs."""
+        index: Dict[str, int] = {}
+        for exp in expenses:
+            self._record_sequence(exp.id, index)
+        self._max_seq_by_date = index
+
+    @staticmethod
+    def _record_sequence(expense_id: str, index: Dict[str, int]):
+        """Record an expense ID's sequence number in the given index."""
+        parts = expense_id.split('-')
+        if len(parts) == 3 and parts[0] == "EXP":
+            try:
+                seq = int(parts[2])
+            except ValueError:
+                return
+            if seq > index.get(parts[1], 0):
+                index[parts[1]] = seq
+
+    def next_seq(self, date_key: str) -> int:
+        """
+        Get the next unused sequence number for a date.
+
+        Args:
+            date_key: Date in YYYYMMDD format
+
+        Returns:
+            Next sequence number (starting at 1)
+        """
+        if self._max_seq_by_date is None:
+            self.load_all()
+        return self._max_seq_by_date.get(date_key, 0) + 1
+
+    def next_id(self, date: str) -> str:
+        """
+        Generate the next unused expense ID for a date.
+
+        Format: EXP-YYYYMMDD-NNNN, served from the per-date sequence
+        index in O(1) rather than scanning existing IDs.
+
+        Args:
+            date: Date string in YYYY-MM-DD format
+
+        Returns:
+            Unique expense ID
+        """
+        date_key = date.replace('-', '')
+        return f"EXP-{date_key}-{self.next_seq(date_key):04d}"
+
     def add(self, expense: Expense):
         """
         Add a new expense to storage.
-        
+
         Args:
             expense: Expense object to add
         """
-        expenses = self.load_all()
-        expenses.append(expense)
-        self.save_all(expenses)
-        logger.info(f"Added expense: {expense.id}")
+        # NDJSON makes this a single O(1) append; the rest of the file
+        # is neither read nor rewritten.
+        self._append_records([expense])
+        if self._max_seq_by_date is not None:
+            self._record_sequence(expense.id, self._max_seq_by_date)
+        logger.info("Added expense: %s", expense.id)
     
+    def add_many(self, new_expenses: List[Expense]):
+        """
+        Add several expenses with a single file write.
+
+        Args:
+            new_expenses: Expense objects to append
+        """
+        self._append_records(new_expenses)
+        if self._max_seq_by_date is not None:
+            for expense in new_expenses:
+                self._record_sequence(expense.id, self._max_seq_by_date)
+        logger.info("Added %s expenses in one write", len(new_expenses))
+
+    def _append_records(self, new_expenses: List[Expense]):
+        """Append expense records to the data file in one write."""
+        self._append_payload("".join(
+            self._encode_record(exp.to_dict()) for exp in new_expenses
+        ))
+
+        # Mutate the cache and id index in place rather than discarding them
+        if self._cache is not None:
+            self._cache.extend(new_expenses)
+            for exp in new_expenses:
+                self._by_id[exp.id] = exp
+
+    def _append_op(self, record: dict):
+        """Append one mutation record (tombstone/patch) to the data file."""
+        self._append_payload(self._encode_record(record))
+
+    @contextmanager
+    def batch(self):
+        """
+        Buffer appends made inside the block into a single durable write.
+
+        Each append normally pays its own open/write/fsync; inside a
+        batch the encoded lines are collected in memory and flushed with
+        one write and one fsync when the block exits. Nested batches
+        join the outermost one.
+        """
+        if self._batch_buf is not None:
+            yield
+            return
+        # Warm the cache first so reads inside the batch are served from
+        # memory and see the buffered, not-yet-written appends
+        self.load_all_cached()
+        self._batch_buf = []
+        try:
+            yield
+        finally:
+            buffered, self._batch_buf = self._batch_buf, None
+            if buffered:
+                self._append_payload("".join(buffered))
+
+    def _append_payload(self, payload: str):
+        """Durably append pre-encoded lines to the data file."""
+        if self._batch_buf is not None:
+            self._batch_buf.append(payload)
+            return
+        try:
+            if self._append_f is None:
+                self._open_data_file()
+            f = self._append_f
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        except Exception as e:
+            logger.error("Failed to append to data file: %s", e)
+            raise ValueError(f"Error: Could not write to data file - {e}")
+        self._note_mtime()
+
     def delete(self, expense_id: str) -> bool:
         """
         Delete an expense by ID.
@@ -110,15 +581,22 @@ class ExpenseStorage:
         Returns:
             True if deleted, False if not found
         """
-        expenses = self.load_all()
-        initial_count = len(expenses)
-        expenses = [exp for exp in expenses if exp.id != expense_id]
-        
-        if len(expenses) < initial_count:
-            self.save_all(expenses)
-            logger.info(f"Deleted expense: {expense_id}")
-            return True
-        return False
+        expenses = self.load_all_cached()
+
+        # O(1) existence check via the id index instead of a list scan
+        expense = self._by_id.pop(expense_id, None)
+        if expense is None:
+            return False
+
+        for i, exp in enumerate(expenses):
+            if exp is expense:
+                del expenses[i]
+                break
+
+        # Append a tombstone instead of rewriting the whole file
+        self._append_op({"op": "del", "id": expense_id})
+        logger.info("Deleted expense: %s", expense_id)
+        return True
     
     def update(self, expense_id: str, updates: dict) -> Optional[Expense]:
         """
@@ -131,16 +609,54 @@ class ExpenseStorage:
         Returns:
             Updated Expense object or None if not found
         """
-        expenses = self.load_all()
-        
-        for i, exp in enumerate(expenses):
-            if exp.id == expense_id:
-                # Update fields
-                exp_dict = exp.to_dict()
-                exp_dict.update(updates)
-                expenses[i] = Expense.from_dict(exp_dict)
-                self.save_all(expenses)
-                logger.info(f"Updated expense: {expense_id}")
-                return expenses[i]
-        
-        return None
\ No newline at end of file
+        self.load_all_cached()
+
+        expense = self._by_id.get(expense_id)
+        if expense is None:
+            return None
+
+        unknown = updates.keys() - _UPDATABLE_FIELDS
+        if unknown:
+            raise ValueError(f"Error: Cannot update field(s): {', '.join(sorted(unknown))}")
+
+        # Set the fields on the cached object directly (no
+        # dict-roundtrip rebuild) and append a patch record instead of
+        # rewriting the whole file
+        for field, value in updates.items():
+            setattr(expense, field, value)
+        if "category" in updates:
+            expense.category = sys.intern(expense.category)
+
+        self._append_op({"op": "upd", "id": expense_id, "set": updates})
+        logger.info("Updated expense: %s", expense_id)
+        return expense
+
+    def export_pretty(self, dest_path: str):
+        """
+        Write all expenses to a human-readable indented JSON document.
+
+        The data file itself stays compact NDJSON; indentation is only
+        worth paying for when a person is going to read the output.
+
+        Args:
+            dest_path: Path of the JSON file to write
+        """
+        expenses = self.load_all_cached()
+        data = {"version": 1, "expenses": [exp.to_dict() for exp in expenses]}
+        try:
+            with open(dest_path, 'w') as f:
+                json.dump(data, f, indent=2)
+                f.write("\n")
+        except Exception as e:
+            logger.error("Failed to export expenses: %s", e)
+            raise ValueError(f"Error: Could not write to {dest_path} - {e}")
+        logger.info("Exported %s expenses to %s", len(expenses), dest_path)
+
+    def checkpoint(self):
+        """
+        Compact the data file, folding mutation records into plain rows.
+
+        Normally triggered automatically once enough superseded records
+        accumulate, but callers can force it after heavy churn.
+        """
+        self.save_all(self.load_all_cached())
\ No newline at end of file
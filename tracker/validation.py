@@ -2,122 +2,108 @@
 Input validation functions for the expense tracker.
 """
 
+import calendar
+import re
+import sys
+import time
 from datetime import datetime
 from tracker.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Precompiled YYYY-MM-DD matcher; strptime's locale-aware parser (and
+# its exception on failure) is far slower than a regex plus range check
+_DATE_RE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})$')
 
-def validate_date(date_str: str) -> bool:
-    """
-    Validate date format (YYYY-MM-DD).
-    
-    Args:
-        date_str: Date string to validate
-        
-    Returns:
-        True if valid, False otherwise
-    """
-    try:
-        datetime.strptime(date_str, "%Y-%m-%d")
-        return True
-    except ValueError:
-        logger.warning(f"Invalid date format: {date_str}")
-        return False
-
-
-def validate_amount(amount: float) -> bool:
-    """
-    Validate that amount is positive.
-    
-    Args:
-        amount: Amount to validate
-        
-    Returns:
-        True if valid, False otherwise
-    """
-    if amount <= 0:
-        logger.warning(f"Invalid amount (must be > 0): {amount}")
-        return False
-    return True
+# Today's date string, refreshed at most once per second so batched
+# format_date('today') calls skip the clock read and strftime
+_today_cache = [0.0, ""]
 
-
-def validate_category(category: str) -> bool:
-    """
-    Validate category is not empty.
-    
-    Args:
-        category: Category to validate
-        
-    Returns:
-        True if valid, False otherwise
-    """
-    if not category or not category.strip():
-        logger.warning("Category cannot be empty")
-        return False
-    return True
+# Plain decimal number; checking this up front keeps the common bad
+# input off the (much slower) float() exception path
+_NUM_RE = re.compile(r'^-?\d+(\.\d+)?$')
 
 
 def format_date(date_str: str) -> str:
     """
-    Format and validate date string.
-    
+    Validate and format a date string in a single pass.
+
     Args:
         date_str: Date string (YYYY-MM-DD format or 'today')
-        
+
     Returns:
         Formatted date string
-        
+
     Raises:
         ValueError: If date format is invalid
     """
     if not date_str or date_str.lower() == 'today':
-        return datetime.now().strftime("%Y-%m-%d")
-    
-    if not validate_date(date_str):
-        raise ValueError("Error: date must be in YYYY-MM-DD format")
-    
-    return date_str
+        now = time.time()
+        if now - _today_cache[0] > 1.0:
+            _today_cache[0] = now
+            _today_cache[1] = datetime.now().strftime("%Y-%m-%d")
+        return _today_cache[1]
+
+    match = _DATE_RE.match(date_str)
+    if match:
+        year, month, day = map(int, match.groups())
+        # monthrange quietly normalizes out-of-range years, so year 0
+        # (which strptime rejected) needs its own check
+        if (year >= 1 and 1 <= month <= 12
+                and 1 <= day <= calendar.monthrange(year, month)[1]):
+            return date_str
+
+    logger.warning("Invalid date format: %s", date_str)
+    raise ValueError("Error: date must be in YYYY-MM-DD format")
 
 
 def format_amount(amount: float) -> float:
     """
-    Format and validate amount.
-    
+    Validate and format an amount in a single pass.
+
     Args:
         amount: Amount to format
-        
+
     Returns:
         Formatted amount
-        
+
     Raises:
         ValueError: If amount is invalid
     """
-    try:
+    # Discriminate by type instead of raising float() errors and
+    # inspecting their message
+    if isinstance(amount, (int, float)) and not isinstance(amount, bool):
         amount_float = float(amount)
-        if not validate_amount(amount_float):
-            raise ValueError("Error: amount must be > 0")
-        return round(amount_float, 2)
-    except ValueError as e:
-        if "could not convert" in str(e):
-            raise ValueError("Error: amount must be a valid number")
-        raise
+    elif isinstance(amount, str) and _NUM_RE.match(amount.strip()):
+        amount_float = float(amount)
+    else:
+        logger.warning("Invalid amount (not a number): %s", amount)
+        raise ValueError("Error: amount must be a valid number")
+
+    if amount_float <= 0:
+        logger.warning("Invalid amount (must be > 0): %s", amount)
+        raise ValueError("Error: amount must be > 0")
+    return round(amount_float, 2)
 
 
 def format_category(category: str) -> str:
     """
-    Format and validate category.
-    
+    Validate and format a category in a single pass.
+
     Args:
         category: Category to format
-        
+
     Returns:
         Formatted category (lowercase, trimmed)
-        
+
     Raises:
         ValueError: If category is invalid
     """
-    if not validate_category(category):
+    stripped = category.strip() if category else ""
+    if not stripped:
+        logger.warning("Category cannot be empty")
         raise ValueError("Error: category cannot be empty")
-    
-    return category.strip().lower()
\ No newline at end of file
+
+    # Intern so the handful of distinct categories share one string
+    # object and downstream equality checks are pointer comparisons
+    return sys.intern(stripped.lower())